@@ -4,11 +4,22 @@
 # This module handles password hashing, JWT token creation/
 # verification, and role-based access control for the API.
 
-from passlib.context import CryptContext
-from jose import JWTError, jwt
+import bcrypt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+import jwt
+from jwt import PyJWTError
 from datetime import datetime, timedelta, timezone
 from fastapi import Depends, HTTPException, Header
 from typing import Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import hashlib
+import hmac
+import os
+import threading
+import time
 
 # ============================================================
 # SECURITY CONFIGURATION
@@ -22,18 +33,60 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 60  # Token validity duration
 # ============================================================
 # PASSWORD HASHING
 # ============================================================
-# Initialize bcrypt password hashing context.
-# Uses bcrypt algorithm for secure password storage.
-pwd_context = CryptContext(
-    schemes=["bcrypt"],
-    deprecated="auto"  # Auto-upgrade deprecated schemes
+# New passwords are hashed with Argon2id via argon2-cffi (the C
+# reference implementation). Legacy bcrypt hashes ("$2b$...") still
+# verify and are re-hashed to Argon2 on the user's next login.
+# Cost parameters come from the environment so they can be tuned to
+# the production CPU (run tests/calibrate_argon2.py to pick them).
+# Changing them re-hashes stored passwords on each user's next login.
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "3"))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", "65536"))  # KiB (64 MiB)
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", "4"))
+
+password_hasher = PasswordHasher(
+    time_cost=ARGON2_TIME_COST,
+    memory_cost=ARGON2_MEMORY_COST,
+    parallelism=ARGON2_PARALLELISM
 )
 
+BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    """Check a password against an Argon2 or legacy bcrypt hash.
+    
+    Malformed or unknown hashes never match.
+    """
+    if hashed_password.startswith("$argon2"):
+        try:
+            return password_hasher.verify(hashed_password, plain_password)
+        except (VerificationError, InvalidHashError):
+            return False
+    if hashed_password.startswith(BCRYPT_PREFIXES):
+        try:
+            return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
+        except ValueError:
+            return False
+    return False
+
+# ============================================================
+# PASSWORD VERIFY CACHE
+# ============================================================
+# Optional in-process cache of successful verifications, keyed by
+# (stored hash, sha256 of the plain password) - the plain password
+# itself is never stored. Only matches are cached, so wrong guesses
+# still pay the full KDF cost. Disabled by default because a
+# hit skips the KDF slowdown; enable with PASSWORD_VERIFY_CACHE=1.
+PASSWORD_VERIFY_CACHE = os.getenv("PASSWORD_VERIFY_CACHE", "0").lower() in ("1", "true", "yes")
+PASSWORD_VERIFY_CACHE_MAXSIZE = 1024
+
+_verify_cache: "OrderedDict[tuple[str, bytes], bool]" = OrderedDict()
+_verify_cache_lock = threading.Lock()
+
 # ============================================================
 # PASSWORD FUNCTIONS
 # ============================================================
 def hash_password(password: str) -> str:
-    """Hash a plain text password using bcrypt.
+    """Hash a plain text password using Argon2id.
     
     Args:
         password: Plain text password to hash
@@ -41,7 +94,7 @@ def hash_password(password: str) -> str:
     Returns:
         Hashed password string
     """
-    return pwd_context.hash(password)
+    return password_hasher.hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify plain text password against hashed password.
@@ -53,7 +106,118 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         True if password matches, False otherwise
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    if not PASSWORD_VERIFY_CACHE:
+        return _verify(plain_password, hashed_password)
+
+    key = (hashed_password, hashlib.sha256(plain_password.encode()).digest())
+    with _verify_cache_lock:
+        if key in _verify_cache:
+            _verify_cache.move_to_end(key)
+            return True
+
+    if not _verify(plain_password, hashed_password):
+        return False
+
+    with _verify_cache_lock:
+        _verify_cache[key] = True
+        if len(_verify_cache) > PASSWORD_VERIFY_CACHE_MAXSIZE:
+            _verify_cache.popitem(last=False)  # Evict least recently used
+    return True
+
+def needs_rehash(hashed_password: str) -> bool:
+    """Check if a stored hash was made with outdated settings.
+    
+    Args:
+        hashed_password: Hashed password from database
+        
+    Returns:
+        True if the hash should be regenerated (legacy bcrypt hash
+        or Argon2 parameters changed)
+    """
+    if not hashed_password.startswith("$argon2"):
+        return True
+    try:
+        return password_hasher.check_needs_rehash(hashed_password)
+    except InvalidHashError:
+        return True
+
+# ============================================================
+# ASYNC PASSWORD FUNCTIONS
+# ============================================================
+# Password KDFs are deliberately slow (tens to hundreds of ms per
+# call). Async endpoints run them on a dedicated pool sized to the
+# CPU count so KDF work runs in parallel across cores without tying
+# up the request threadpool or the event loop. A thread pool is
+# enough: argon2-cffi and bcrypt release the GIL while hashing.
+# Override the size with KDF_WORKERS.
+KDF_WORKERS = int(os.getenv("KDF_WORKERS", str(os.cpu_count() or 1)))
+KDF_POOL = ThreadPoolExecutor(max_workers=KDF_WORKERS, thread_name_prefix="kdf")
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the KDF pool (see hash_password)."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(KDF_POOL, hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the KDF pool (see verify_password)."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        KDF_POOL, verify_password, plain_password, hashed_password
+    )
+
+# ============================================================
+# FAILED LOGIN LIMIT
+# ============================================================
+# Count of failed logins per (client IP, email) in the current window,
+# kept in-process. Once a pair reaches LOGIN_MAX_FAILURES, further
+# attempts from that client are rejected before the DB lookup and the
+# KDF run, until the window expires. Keying on the client as well as
+# the email means a third party can't lock the owner out of their own
+# account. A successful login clears the count.
+LOGIN_MAX_FAILURES = int(os.getenv("LOGIN_MAX_FAILURES", "5"))
+LOGIN_FAILURE_WINDOW_SECONDS = int(os.getenv("LOGIN_FAILURE_WINDOW_SECONDS", "300"))
+LOGIN_FAILURES_MAXSIZE = 10000
+
+_login_failures: "OrderedDict[tuple[str, str], tuple[float, int]]" = OrderedDict()
+_login_failures_lock = threading.Lock()
+
+def login_blocked(client: str, email: str) -> bool:
+    """Check if a client has too many recent failed logins for an email.
+    
+    Args:
+        client: Client IP address of the login request
+        email: Email address from the login request
+        
+    Returns:
+        True if the login should be rejected without checking the password
+    """
+    key = (client, email.lower())
+    with _login_failures_lock:
+        entry = _login_failures.get(key)
+        if entry is None:
+            return False
+        started_at, count = entry
+        if time.monotonic() - started_at >= LOGIN_FAILURE_WINDOW_SECONDS:
+            del _login_failures[key]
+            return False
+        return count >= LOGIN_MAX_FAILURES
+
+def record_login_failure(client: str, email: str):
+    """Count a failed login for a client and email (starts a new window if needed)."""
+    key = (client, email.lower())
+    now = time.monotonic()
+    with _login_failures_lock:
+        entry = _login_failures.pop(key, None)
+        if entry is None or now - entry[0] >= LOGIN_FAILURE_WINDOW_SECONDS:
+            entry = (now, 0)
+        _login_failures[key] = (entry[0], entry[1] + 1)
+        if len(_login_failures) > LOGIN_FAILURES_MAXSIZE:
+            _login_failures.popitem(last=False)  # Drop the oldest entry
+
+def clear_login_failures(client: str, email: str):
+    """Reset the failed login count for a client and email after a successful login."""
+    with _login_failures_lock:
+        _login_failures.pop((client, email.lower()), None)
 
 # ============================================================
 # JWT TOKEN FUNCTIONS
@@ -62,7 +226,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     """Create a JWT access token.
     
     Args:
-        data: Dictionary containing token claims (e.g., user email, role)
+        data: Dictionary containing token claims (e.g., user ID, role)
         expires_delta: Custom token expiration time (optional)
         
     Returns:
@@ -76,6 +240,50 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
+# ============================================================
+# TOKEN DECODE CACHE
+# ============================================================
+# Verified token payloads are cached in-process, keyed by the raw
+# token string, so repeat requests from the same client skip the
+# signature check. Entries expire after TOKEN_CACHE_TTL_SECONDS
+# and are never served past the token's own "exp" claim.
+TOKEN_CACHE_MAXSIZE = 4096
+TOKEN_CACHE_TTL_SECONDS = 60
+
+_token_cache: "OrderedDict[str, tuple[float, dict]]" = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+def decode_access_token(token: str) -> dict:
+    """Decode and verify a JWT token, using the token cache.
+    
+    Args:
+        token: Encoded JWT token string
+        
+    Returns:
+        Decoded JWT payload
+        
+    Raises:
+        PyJWTError: If the token signature is invalid or expired
+    """
+    with _token_cache_lock:
+        cached = _token_cache.get(token)
+        if cached is not None:
+            cached_at, payload = cached
+            if (time.monotonic() - cached_at < TOKEN_CACHE_TTL_SECONDS
+                    and payload.get("exp", 0) > time.time()):
+                _token_cache.move_to_end(token)
+                return payload
+            del _token_cache[token]
+
+    # Cache miss: verify signature and expiry
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+
+    with _token_cache_lock:
+        _token_cache[token] = (time.monotonic(), payload)
+        if len(_token_cache) > TOKEN_CACHE_MAXSIZE:
+            _token_cache.popitem(last=False)  # Evict least recently used
+    return payload
+
 # ============================================================
 # AUTHENTICATION DEPENDENCY
 # ============================================================
@@ -105,15 +313,15 @@ def get_current_user(authorization: str = Header(None)) -> dict:
                 detail="Invalid authentication scheme. Use 'Bearer' scheme."
             )
         
-        # Decode JWT token and verify signature
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        # Decode JWT token and verify signature (cached)
+        payload = decode_access_token(token)
         return payload
     except ValueError:
         raise HTTPException(
             status_code=401,
             detail="Invalid authorization header format. Use 'Bearer <token>'"
         )
-    except JWTError as e:
+    except PyJWTError:
         raise HTTPException(
             status_code=401,
             detail="Invalid or expired token"
@@ -140,10 +348,19 @@ def require_role(required_role: str):
         HTTPException: If user doesn't have required role
     """
     def role_checker(user=Depends(get_current_user)) -> dict:
-        if user.get("role") != required_role:
+        # Constant-time comparison; use hmac.compare_digest for any
+        # other secret/claim comparisons added to this module too
+        if not hmac.compare_digest(
+            str(user.get("role", "")).encode(), required_role.encode()
+        ):
             raise HTTPException(
                 status_code=403,
                 detail=f"Access denied. Required role: {required_role}"
             )
         return user
-    return role_checker
\ No newline at end of file
+    return role_checker
+
+# Shared role dependency, created once at import. Use it in routers
+# (e.g. Depends(require_admin)) instead of calling require_role()
+# inline for every endpoint.
+require_admin = require_role("admin")
@@ -5,9 +5,10 @@
 # database engine, session factory, and provides dependency
 # injection for database sessions in API endpoints.
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
 # ============================================================
 # DATABASE URL AND ENGINE
@@ -27,23 +28,110 @@ SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./inventory.db")
 # connect_args={"check_same_thread": False} is ONLY for SQLite
 connect_args = {"check_same_thread": False} if "sqlite" in SQLALCHEMY_DATABASE_URL else {}
 
+# Timeouts that bound request latency under load (seconds / ms).
+# Requests that hit them fail fast with HTTP 503 (see main.py)
+# instead of queueing indefinitely. The statement timeout is applied
+# per transaction on the auth paths only (see set_statement_timeout),
+# so startup DDL and reporting queries aren't cut off.
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "2"))
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "2000"))
+
+# Connection pool settings
+# - In-memory SQLite only exists on one connection, so share it (StaticPool).
+# - File SQLite keeps SQLAlchemy's default QueuePool of per-thread connections.
+# - Server databases get a larger persistent pool; stale connections are
+#   detected with pre-ping and recycled before server-side timeouts.
+if "sqlite" in SQLALCHEMY_DATABASE_URL:
+    if ":memory:" in SQLALCHEMY_DATABASE_URL or SQLALCHEMY_DATABASE_URL.endswith("://"):
+        pool_args = {"poolclass": StaticPool}
+    else:
+        pool_args = {"pool_timeout": DB_POOL_TIMEOUT}
+else:
+    pool_args = {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "20")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        "pool_pre_ping": True,
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        "pool_timeout": DB_POOL_TIMEOUT,  # Max wait for a free connection
+    }
+
+# insertmanyvalues_page_size: rows per multi-row INSERT ... VALUES
+# statement when bulk inserting (fewer round-trips for imports)
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
-    connect_args=connect_args
+    connect_args=connect_args,
+    insertmanyvalues_page_size=1000,
+    **pool_args
 )
 
+# ============================================================
+# SQLITE PRAGMAS
+# ============================================================
+# WAL lets readers proceed while a write is in progress, and
+# synchronous=NORMAL skips the fsync on every commit (still safe
+# in WAL mode). Also use a ~20 MB page cache and in-memory temp
+# tables. Applied to every new SQLite connection.
+if "sqlite" in SQLALCHEMY_DATABASE_URL:
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA cache_size=-20000")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+# ============================================================
+# POOL WARM-UP
+# ============================================================
+def warm_pool():
+    """Open every pool slot once so early requests skip the connect cost.
+    
+    Connections are held open together; opening them one at a time
+    would just reuse the same pooled connection.
+    """
+    size = engine.pool.size() if hasattr(engine.pool, "size") else 1
+    connections = []
+    try:
+        for _ in range(size):
+            conn = engine.connect()
+            connections.append(conn)
+            conn.execute(text("SELECT 1"))
+    finally:
+        for conn in connections:
+            conn.close()  # Returns the connection to the pool
+
 # ============================================================
 # SESSION FACTORY
 # ============================================================
 # SessionLocal creates new database sessions for each request.
 # autocommit=False: Changes aren't committed until explicitly done
 # autoflush=False: Objects aren't flushed to database automatically
+# expire_on_commit=False: Objects keep their loaded values after commit,
+#   so returning a just-created row doesn't trigger a reload SELECT
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
+    expire_on_commit=False,
     bind=engine
 )
 
+# ============================================================
+# STATEMENT TIMEOUT
+# ============================================================
+def set_statement_timeout(db):
+    """Cap statement run time for the rest of the session's transaction.
+    
+    Uses SET LOCAL, so the limit ends at commit/rollback and never
+    leaks to other users of the pooled connection. Postgres only;
+    other databases are left unchanged.
+    
+    Args:
+        db (Session): Database session to apply the timeout to
+    """
+    if engine.dialect.name == "postgresql":
+        db.execute(text(f"SET LOCAL statement_timeout = {DB_STATEMENT_TIMEOUT_MS}"))
+
 # ============================================================
 # DECLARATIVE BASE
 # ============================================================
@@ -57,6 +145,11 @@ Base = declarative_base()
 # This generator function provides database sessions to endpoint
 # functions via FastAPI's Depends() mechanism. Database is
 # automatically closed after each request completes.
+# FastAPI caches dependencies per request, so every dependency that
+# asks for get_db in one request shares this single session (and at
+# most one pooled connection). A thread-local scoped_session is not
+# used on purpose: async endpoints hand the session between threadpool
+# threads, which would give them a different session per thread.
 def get_db():
     """Provide database session for dependency injection."""
     db = SessionLocal()
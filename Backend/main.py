@@ -5,11 +5,19 @@
 # database tables, configures CORS middleware, and registers
 # all API routers for users, products, and sales management.
 
-from fastapi import FastAPI
+import logging
+import os
+from contextlib import asynccontextmanager
+import anyio.to_thread
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
 from routers import users, product, sales
 import models
-from database import engine
+from database import engine, warm_pool
 
 # ============================================================
 # DATABASE INITIALIZATION
@@ -18,11 +26,119 @@ from database import engine
 # don't already exist. This runs once on application startup.
 models.Base.metadata.create_all(bind=engine)
 
+SALES_COPY_SQL = (
+    "INSERT INTO sales (id, product_id, quantity, total_price, sale_date) "
+    "SELECT id, product_id, quantity, total_price, "
+    "COALESCE(sale_date, CURRENT_TIMESTAMP) FROM sales_old "
+    "WHERE id NOT IN (SELECT id FROM sales)"
+)
+
+def _upgrade_sqlite_sales():
+    """Rebuild a legacy SQLite sales table with the sale_date default.
+    
+    SQLite can't change a column default in place, so the table is
+    renamed, recreated and copied. pysqlite doesn't open a transaction
+    before DDL, so BEGIN IMMEDIATE is issued explicitly: the whole
+    rebuild commits or rolls back as one unit, and a second worker
+    starting at the same time waits for the lock, then sees the
+    upgraded table. A sales_old table left behind by an interrupted
+    rebuild (from before this was atomic) is merged back first.
+    """
+    with engine.connect() as conn:
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+        try:
+            inspector = inspect(conn)
+            if inspector.has_table("sales_old"):
+                conn.execute(text(SALES_COPY_SQL))
+                conn.execute(text("DROP TABLE sales_old"))
+
+            column = next(
+                col for col in inspect(conn).get_columns("sales")
+                if col["name"] == "sale_date"
+            )
+            if column.get("default") is None:
+                conn.execute(text("ALTER TABLE sales RENAME TO sales_old"))
+                for index in inspect(conn).get_indexes("sales_old"):
+                    conn.execute(text(f'DROP INDEX "{index["name"]}"'))
+                models.Sale.__table__.create(bind=conn)
+                conn.execute(text(SALES_COPY_SQL))
+                conn.execute(text("DROP TABLE sales_old"))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+def ensure_sale_date_default():
+    """Bring a legacy sales.sale_date column in line with the model.
+    
+    Older databases filled sale_date in Python (naive UTC, nullable,
+    no default); inserts now rely on the database default, so legacy
+    tables are upgraded once at startup.
+    """
+    if engine.dialect.name == "sqlite":
+        _upgrade_sqlite_sales()
+        return
+
+    column = next(
+        col for col in inspect(engine).get_columns("sales")
+        if col["name"] == "sale_date"
+    )
+    is_timezone_aware = getattr(column["type"], "timezone", False)
+    if (column.get("default") is not None and not column["nullable"]
+            and is_timezone_aware):
+        return
+
+    with engine.begin() as conn:
+        if not is_timezone_aware:
+            # Legacy values were written as UTC
+            conn.execute(text(
+                "ALTER TABLE sales ALTER COLUMN sale_date TYPE timestamptz "
+                "USING sale_date AT TIME ZONE 'UTC'"
+            ))
+        conn.execute(text(
+            "UPDATE sales SET sale_date = CURRENT_TIMESTAMP WHERE sale_date IS NULL"
+        ))
+        conn.execute(text("ALTER TABLE sales ALTER COLUMN sale_date SET NOT NULL"))
+        conn.execute(text(
+            "ALTER TABLE sales ALTER COLUMN sale_date SET DEFAULT CURRENT_TIMESTAMP"
+        ))
+
+ensure_sale_date_default()
+
+# create_all() skips tables that already exist, so add any indexes
+# introduced after a table was first created.
+for table in models.Base.metadata.sorted_tables:
+    for index in table.indexes:
+        index.create(bind=engine, checkfirst=True)
+
+# ============================================================
+# APPLICATION LIFESPAN
+# ============================================================
+# Most endpoints are plain "def" functions, so FastAPI runs them in
+# a worker threadpool and blocking DB calls never stall the event
+# loop (login/register hash passwords on auth.KDF_POOL instead).
+# THREADPOOL_SIZE sets how many can run at once (anyio's default
+# is 40); size it together with the DB pool.
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", "40"))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Configure runtime resources on startup."""
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = THREADPOOL_SIZE
+
+    # Pre-open pooled DB connections so the first requests don't
+    # pay the connect/handshake cost
+    await run_in_threadpool(warm_pool)
+    yield
+
 # Initialize FastAPI application
 app = FastAPI(
     title="Smart Inventory System API",
     description="API for managing inventory, products, sales, and users",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,  # Serialize responses with orjson
+    lifespan=lifespan
 )
 
 # ============================================================
@@ -30,15 +146,64 @@ app = FastAPI(
 # ============================================================
 # Enable Cross-Origin Resource Sharing to allow requests from
 # different domains (frontend communicating with backend).
-# In production, replace "*" with specific allowed origins.
+# Allowed origins come from CORS_ORIGINS (comma-separated); the
+# default covers the Vite and CRA dev servers.
+CORS_ORIGINS = [
+    origin.strip()
+    for origin in os.getenv(
+        "CORS_ORIGINS", "http://localhost:5173,http://localhost:3000"
+    ).split(",")
+    if origin.strip()
+]
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Allow all origins (change in production)
+    allow_origins=CORS_ORIGINS,  # Explicit origins ("*" is invalid with credentials)
     allow_credentials=True,  # Allow credentials like cookies/auth headers
-    allow_methods=["*"],  # Allow all HTTP methods
-    allow_headers=["*"],  # Allow all headers
+    allow_methods=["GET", "POST", "DELETE"],  # Methods used by the API
+    allow_headers=["Authorization", "Content-Type"],  # Headers sent by the frontend
+    max_age=86400,  # Let browsers cache preflight responses for a day
 )
 
+# ============================================================
+# DATABASE TIMEOUT HANDLING
+# ============================================================
+# Pool exhaustion (no free connection within DB_POOL_TIMEOUT), a
+# statement cancelled by statement_timeout and a locked SQLite
+# database return 503 so clients can retry, rather than tying up a
+# worker indefinitely. Other operational errors (missing tables,
+# auth failures, full disk) are real faults and return 500.
+logger = logging.getLogger(__name__)
+
+PG_QUERY_CANCELED = "57014"  # SQLSTATE for a cancelled statement
+
+def is_database_busy(exc: Exception) -> bool:
+    """Return True if a DB error is a transient overload worth retrying."""
+    if isinstance(exc, PoolTimeoutError):
+        return True
+    orig = getattr(exc, "orig", None)
+    if getattr(orig, "pgcode", None) == PG_QUERY_CANCELED:
+        return True
+    return "database is locked" in str(orig)
+
+@app.exception_handler(PoolTimeoutError)
+@app.exception_handler(OperationalError)
+async def database_error_handler(request: Request, exc: Exception):
+    if is_database_busy(exc):
+        logger.warning("Database busy on %s %s: %s", request.method, request.url.path, exc)
+        return ORJSONResponse(
+            status_code=503,
+            content={"detail": "Database is busy, please try again"}
+        )
+
+    logger.error(
+        "Database error on %s %s", request.method, request.url.path, exc_info=exc
+    )
+    return ORJSONResponse(
+        status_code=500,
+        content={"detail": "Internal Server Error"}
+    )
+
 # ============================================================
 # ROUTER REGISTRATION
 # ============================================================
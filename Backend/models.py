@@ -4,8 +4,7 @@
 # This module defines SQLAlchemy ORM models that map to
 # database tables. Each class represents a table in the database.
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
-from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index, func
 from database import Base
 
 # ============================================================
@@ -18,7 +17,7 @@ class User(Base):
         id (int): Primary key, unique user identifier
         username (str): User's display name
         email (str): Unique email address for login
-        password_hash (str): Bcrypt-hashed password
+        password_hash (str): Argon2id-hashed password (legacy: bcrypt)
         role (str): User role ('admin' or 'staff')
     """
     __tablename__ = "users"
@@ -64,13 +63,19 @@ class Sale(Base):
         sale_date (datetime): When the sale occurred
     """
     __tablename__ = "sales"
-    
+    __table_args__ = (
+        # Covers date-range filters that also group by product
+        Index("ix_sales_date_pid", "sale_date", "product_id"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
     quantity = Column(Integer, nullable=False)
     total_price = Column(Float, nullable=False)
     sale_date = Column(
-        DateTime,
-        default=lambda: datetime.now(timezone.utc)
+        DateTime(timezone=True),
+        server_default=func.now(),  # Filled by the DB, returned on INSERT
+        nullable=False,
+        index=True  # Analytics filter by sale_date ranges
     )
 
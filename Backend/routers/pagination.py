@@ -0,0 +1,42 @@
+# ============================================================
+# LIST PAGINATION HELPERS
+# ============================================================
+# Shared by the product and sales list endpoints: page through a
+# table ordered by ID and serialize the page to JSON bytes.
+
+from typing import Optional
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Query
+
+def paginate(query: Query, model, skip: int, limit: int, after_id: Optional[int]) -> list:
+    """Return one page of rows from a query, ordered by ID.
+    
+    Args:
+        query (Query): Base query over the model
+        model: ORM model class with an integer "id" column
+        skip (int): Number of rows to skip
+        limit (int): Maximum number of rows to return
+        after_id (int): Only return rows with ID greater than this
+    
+    Returns:
+        list: Page of ORM rows
+    """
+    # Keyset pagination: cheaper than a large OFFSET on big tables
+    if after_id is not None:
+        query = query.filter(model.id > after_id)
+
+    return query.order_by(model.id).offset(skip).limit(limit).all()
+
+def dump_list(adapter: TypeAdapter, rows: list) -> bytes:
+    """Validate ORM rows against a list schema and serialize to JSON.
+    
+    The whole list goes through the adapter in one pass.
+    
+    Args:
+        adapter (TypeAdapter): Adapter for a list of response schemas
+        rows (list): ORM rows to serialize
+    
+    Returns:
+        bytes: JSON-encoded list
+    """
+    return adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
@@ -5,32 +5,86 @@
 # Includes endpoints for viewing, creating, and deleting products.
 # Admin-only operations are protected with role-based access control.
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
+from typing import Optional
+from pydantic import TypeAdapter
+import threading
 from database import get_db
 import models, schemas
-from auth import require_role
+from auth import require_admin
+from routers.pagination import paginate, dump_list
 
 # Create router for product endpoints
 router = APIRouter()
 
+# Validator/serializer for list responses, built once at import
+_ProductListAdapter = TypeAdapter(list[schemas.Product])
+
+# ============================================================
+# PRODUCT LIST CACHE
+# ============================================================
+# Serialized product pages are cached in-process, keyed by the
+# query parameters. Any write that changes products or stock
+# calls invalidate_products_cache(), which bumps the generation
+# and makes every cached page stale. Each worker process has its
+# own cache.
+PRODUCTS_CACHE_MAX_PAGES = 256
+
+_products_cache = {"gen": 0, "data_gen": 0, "pages": {}}
+_products_cache_lock = threading.Lock()
+
+def invalidate_products_cache():
+    """Mark cached product lists as stale. Call after committing writes."""
+    with _products_cache_lock:
+        _products_cache["gen"] += 1
+
 # ============================================================
 # GET ALL PRODUCTS ENDPOINT
 # ============================================================
 @router.get("/", response_model=list[schemas.Product])
-def get_products(db: Session = Depends(get_db)):
-    """Retrieve all products from inventory.
+def get_products(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=1000),
+    after_id: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """Retrieve products from inventory, one page at a time.
     
     Accessible to all authenticated users.
     
     Args:
+        skip (int): Number of products to skip
+        limit (int): Maximum number of products to return (max 1000)
+        after_id (int): Only return products with ID greater than this
         db (Session): Database session (injected)
         
     Returns:
-        list[Product]: List of all products
+        list[Product]: Page of products ordered by ID
     """
-    products = db.query(models.Product).all()
-    return products
+    key = (skip, limit, after_id)
+    with _products_cache_lock:
+        gen = _products_cache["gen"]
+        if _products_cache["data_gen"] == gen and key in _products_cache["pages"]:
+            return Response(
+                content=_products_cache["pages"][key],
+                media_type="application/json"
+            )
+
+    products = paginate(db.query(models.Product), models.Product, skip, limit, after_id)
+    content = dump_list(_ProductListAdapter, products)
+
+    # Store only if no write happened while we were querying
+    with _products_cache_lock:
+        if _products_cache["gen"] == gen:
+            if (_products_cache["data_gen"] != gen
+                    or len(_products_cache["pages"]) >= PRODUCTS_CACHE_MAX_PAGES):
+                _products_cache["pages"] = {}
+                _products_cache["data_gen"] = gen
+            _products_cache["pages"][key] = content
+
+    return Response(content=content, media_type="application/json")
 
 # ============================================================
 # CREATE PRODUCT ENDPOINT - ADMIN ONLY
@@ -39,7 +93,7 @@ def get_products(db: Session = Depends(get_db)):
 def create_product(
     product: schemas.ProductCreate,
     db: Session = Depends(get_db),
-    user=Depends(require_role("admin"))
+    user=Depends(require_admin)
 ):
     """Create a new product. Admin only.
     
@@ -68,9 +122,18 @@ def create_product(
         # Save to database
         db.add(new_product)
         db.commit()
-        db.refresh(new_product)
+        invalidate_products_cache()
         
-        return new_product
+        # Row values are trusted (just written), so skip response_model
+        # re-validation and serialize directly
+        body = schemas.Product.model_construct(
+            id=new_product.id,
+            name=new_product.name,
+            description=new_product.description,
+            price=new_product.price,
+            quantity=new_product.quantity
+        )
+        return ORJSONResponse(body.model_dump(mode="json"))
     except Exception as e:
         print(f"Error creating product: {e}")
         raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
@@ -82,7 +145,7 @@ def create_product(
 def delete_product(
     product_id: int,
     db: Session = Depends(get_db),
-    user=Depends(require_role("admin"))
+    user=Depends(require_admin)
 ):
     """Delete a product by ID. Admin only.
     
@@ -99,13 +162,12 @@ def delete_product(
     Raises:
         HTTPException: If product not found or user is not admin
     """
-    # Look up product by ID
-    product = db.query(models.Product).filter(
+    # Check if product exists (fetch only the ID)
+    exists = db.query(models.Product.id).filter(
         models.Product.id == product_id
-    ).first()
+    ).scalar()
 
-    # Check if product exists
-    if not product:
+    if exists is None:
         raise HTTPException(
             status_code=404,
             detail="Product not found"
@@ -117,7 +179,10 @@ def delete_product(
     ).delete()
 
     # Delete from database
-    db.delete(product)
+    db.query(models.Product).filter(
+        models.Product.id == product_id
+    ).delete()
     db.commit()
+    invalidate_products_cache()
 
     return {"message": "Product deleted successfully"}
@@ -5,33 +5,50 @@
 # Includes endpoints for viewing, creating, and deleting sales.
 # When a sale is created, inventory is automatically updated.
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from typing import Optional
+from pydantic import TypeAdapter
+from sqlalchemy import func, case, insert
 from database import get_db
 from datetime import datetime, timedelta, timezone
 import models, schemas
+from routers.product import invalidate_products_cache
+from routers.pagination import paginate, dump_list
 
 # Create router for sales endpoints
 router = APIRouter()
 
+# Validator/serializer for list responses, built once at import
+_SaleListAdapter = TypeAdapter(list[schemas.Sale])
+
 # ============================================================
 # GET ALL SALES ENDPOINT
 # ============================================================
 @router.get("/", response_model=list[schemas.Sale])
-def get_sales(db: Session = Depends(get_db)):
-    """Retrieve all sales transactions.
+def get_sales(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=1000),
+    after_id: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """Retrieve sales transactions, one page at a time.
     
-    Returns a list of all recorded sales in the system.
+    Returns a page of recorded sales ordered by ID.
     
     Args:
+        skip (int): Number of sales to skip
+        limit (int): Maximum number of sales to return (max 1000)
+        after_id (int): Only return sales with ID greater than this
         db (Session): Database session (injected)
         
     Returns:
-        list[Sale]: List of all sales with details
+        list[Sale]: Page of sales with details
     """
-    sales = db.query(models.Sale).all()
-    return sales
+    sales = paginate(db.query(models.Sale), models.Sale, skip, limit, after_id)
+    content = dump_list(_SaleListAdapter, sales)
+    return Response(content=content, media_type="application/json")
 
 # ============================================================
 # CREATE SALE ENDPOINT
@@ -54,46 +71,93 @@ def create_sale(sale: schemas.SaleCreate, db: Session = Depends(get_db)):
         HTTPException: If product not found or insufficient stock
     """
     # ============================================================
-    # INVENTORY VALIDATION
+    # UPDATE INVENTORY (ATOMIC STOCK CHECK)
     # ============================================================
-    # Check if product exists
-    product = db.query(models.Product).filter(
-        models.Product.id == sale.product_id
-    ).first()
-    
-    if not product:
-        raise HTTPException(
-            status_code=404,
-            detail="Product not found"
-        )
+    # Deduct sold quantity only if enough stock is available. Doing
+    # the check inside the UPDATE avoids a race between concurrent
+    # sales and saves a SELECT round-trip.
+    updated = db.query(models.Product).filter(
+        models.Product.id == sale.product_id,
+        models.Product.quantity >= sale.quantity
+    ).update(
+        {models.Product.quantity: models.Product.quantity - sale.quantity},
+        synchronize_session=False
+    )
     
-    # Check if sufficient stock available
-    if product.quantity < sale.quantity:
+    if not updated:
+        # Nothing updated: product is missing or stock is too low
+        available = db.query(models.Product.quantity).filter(
+            models.Product.id == sale.product_id
+        ).scalar()
+        
+        if available is None:
+            raise HTTPException(
+                status_code=404,
+                detail="Product not found"
+            )
         raise HTTPException(
             status_code=400,
-            detail=f"Insufficient quantity. Available: {product.quantity}"
+            detail=f"Insufficient quantity. Available: {available}"
         )
     
     # ============================================================
-    # UPDATE INVENTORY AND CREATE SALE
+    # CREATE SALE
     # ============================================================
-    # Deduct sold quantity from inventory
-    product.quantity -= sale.quantity
-    
-    # Create sale record
     new_sale = models.Sale(
         product_id=sale.product_id,
         quantity=sale.quantity,
         total_price=sale.total_price
     )
     
-    # Save both product and sale updates
+    # Save sale together with the stock update
     db.add(new_sale)
-    db.add(product)
     db.commit()
-    db.refresh(new_sale)
+    invalidate_products_cache()  # Stock changed
+    
+    # Row values are trusted (just written), so skip response_model
+    # re-validation. mode="json" uses pydantic's datetime format, the
+    # same one GET /sales/ emits
+    body = schemas.Sale.model_construct(
+        id=new_sale.id,
+        product_id=new_sale.product_id,
+        quantity=new_sale.quantity,
+        total_price=new_sale.total_price,
+        sale_date=new_sale.sale_date
+    )
+    return ORJSONResponse(body.model_dump(mode="json"))
+
+# ============================================================
+# BULK SALE INSERT HELPER
+# ============================================================
+def bulk_create_sales(db: Session, sales: list[schemas.SaleCreate]) -> list[int]:
+    """Insert many sale records in batched multi-row INSERTs.
     
-    return new_sale
+    Intended for importing historical sales (e.g. from CSV): product
+    stock is NOT adjusted. The caller is responsible for db.commit().
+    
+    Args:
+        db (Session): Database session
+        sales (list[SaleCreate]): Sales to insert
+        
+    Returns:
+        list[int]: IDs of the inserted sales
+    """
+    if not sales:
+        return []
+
+    payload = [
+        {
+            "product_id": sale.product_id,
+            "quantity": sale.quantity,
+            "total_price": sale.total_price,
+        }
+        for sale in sales
+    ]
+    result = db.execute(
+        insert(models.Sale).returning(models.Sale.id),
+        payload
+    )
+    return list(result.scalars())
 
 # ============================================================
 # DELETE SALE ENDPOINT
@@ -130,19 +194,19 @@ def delete_sale(sale_id: int, db: Session = Depends(get_db)):
     # ============================================================
     # RESTORE INVENTORY
     # ============================================================
-    # Get the product and restore quantity
-    product = db.query(models.Product).filter(
+    # Return sold quantity to inventory in a single UPDATE, so a
+    # concurrent sale's stock change can't be overwritten
+    db.query(models.Product).filter(
         models.Product.id == sale.product_id
-    ).first()
-    
-    if product:
-        # Return sold quantity to inventory
-        product.quantity += sale.quantity
-        db.add(product)
+    ).update(
+        {models.Product.quantity: models.Product.quantity + sale.quantity},
+        synchronize_session=False
+    )
     
     # Delete the sale record
     db.delete(sale)
     db.commit()
+    invalidate_products_cache()  # Stock restored
     
     return {"message": "Sale deleted and inventory restored"}
 
@@ -162,52 +226,64 @@ def get_sales_analytics(db: Session = Depends(get_db)):
     """
     now = datetime.now(timezone.utc)
     today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-    month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    month_start = today_start.replace(day=1)
 
-    # Daily revenue
-    daily_revenue = db.query(
-        func.coalesce(func.sum(models.Sale.total_price), 0)
-    ).filter(models.Sale.sale_date >= today_start).scalar()
+    # Start of each of the last 7 days (oldest first), computed once
+    days = [today_start - timedelta(days=i) for i in range(6, -1, -1)]
 
-    # Monthly revenue
-    monthly_revenue = db.query(
+    # Daily and monthly revenue in one query (conditional aggregation)
+    daily_revenue, monthly_revenue = db.query(
+        func.coalesce(func.sum(case(
+            (models.Sale.sale_date >= today_start, models.Sale.total_price),
+            else_=0
+        )), 0),
         func.coalesce(func.sum(models.Sale.total_price), 0)
-    ).filter(models.Sale.sale_date >= month_start).scalar()
+    ).filter(models.Sale.sale_date >= month_start).one()
 
-    # Top selling product (by total quantity sold)
+    # Top selling product (by total quantity sold), name joined in
     top_product_row = db.query(
         models.Sale.product_id,
+        models.Product.name,
         func.sum(models.Sale.quantity).label("total_qty")
-    ).group_by(models.Sale.product_id).order_by(
+    ).join(
+        models.Product, models.Product.id == models.Sale.product_id
+    ).group_by(
+        models.Sale.product_id, models.Product.name
+    ).order_by(
         func.sum(models.Sale.quantity).desc()
-    ).first()
+    ).limit(1).first()
 
     top_selling_product = None
     if top_product_row:
-        product = db.query(models.Product).filter(
-            models.Product.id == top_product_row.product_id
-        ).first()
         top_selling_product = {
             "id": top_product_row.product_id,
-            "name": product.name if product else "Unknown",
+            "name": top_product_row.name,
             "total_quantity_sold": int(top_product_row.total_qty),
         }
 
-    # Daily sales chart — last 7 days
-    daily_sales_chart = []
-    for i in range(6, -1, -1):
-        day_start = (today_start - timedelta(days=i))
-        day_end = day_start + timedelta(days=1)
-        revenue = db.query(
-            func.coalesce(func.sum(models.Sale.total_price), 0)
-        ).filter(
-            models.Sale.sale_date >= day_start,
-            models.Sale.sale_date < day_end
-        ).scalar()
-        daily_sales_chart.append({
-            "date": day_start.strftime("%b %d"),
+    # Daily sales chart — last 7 days in one query. Each day is summed
+    # against its precomputed UTC boundaries (conditional aggregation)
+    # rather than GROUP BY date(sale_date), which would bucket by the
+    # database session's time zone and disagree with daily_revenue.
+    bounds = days + [today_start + timedelta(days=1)]
+    day_revenues = db.query(*[
+        func.coalesce(func.sum(case(
+            (
+                (models.Sale.sale_date >= start) & (models.Sale.sale_date < end),
+                models.Sale.total_price
+            ),
+            else_=0
+        )), 0)
+        for start, end in zip(bounds, bounds[1:])
+    ]).filter(models.Sale.sale_date >= days[0]).one()
+
+    daily_sales_chart = [
+        {
+            "date": day.strftime("%b %d"),
             "revenue": float(revenue),
-        })
+        }
+        for day, revenue in zip(days, day_revenues)
+    ]
 
     return {
         "daily_revenue": float(daily_revenue),
@@ -4,19 +4,96 @@
 # This module handles user registration and login endpoints.
 # It manages authentication and JWT token creation.
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from database import get_db
+from database import get_db, set_statement_timeout
 import models, schemas, auth
 
 # Create router for user endpoints
 router = APIRouter()
 
+# Hash checked when a login email doesn't exist, so unknown and known
+# emails take the same KDF time (no user-enumeration timing signal)
+DUMMY_PASSWORD_HASH = auth.hash_password("x" * 32)
+
+# ============================================================
+# DATABASE HELPERS
+# ============================================================
+# The endpoints below are async so they can await password hashing
+# on the KDF pool without holding a request thread. Blocking Session
+# calls go through these helpers via run_in_threadpool. Each helper
+# is its own short transaction: the lookups close the session before
+# returning, so no pooled connection is held while the endpoint awaits
+# the KDF (a login burst would otherwise drain the DB pool).
+def _email_exists(db: Session, email: str) -> bool:
+    """Return True if a user with this email exists.
+    
+    The domain is compared case-insensitively, so an older account
+    stored as "Bob@Example.COM" blocks registering "Bob@example.com"
+    (EmailStr lowercases the domain); the local part must match exactly.
+    """
+    local = email.rpartition("@")[0]
+    try:
+        set_statement_timeout(db)
+        stored = db.query(models.User.email).filter(
+            func.lower(models.User.email) == email.lower()
+        ).all()
+        return any(row.email.rpartition("@")[0] == local for row in stored)
+    finally:
+        db.close()  # Release the connection before the KDF runs
+
+def _get_login_row(db: Session, email: str):
+    """Return only the columns login needs for this email, or None.
+    
+    Tries the email exactly as typed, then with the domain lowercased,
+    which is how registration (EmailStr) stores new addresses.
+    """
+    local, _, domain = email.rpartition("@")
+    candidates = [email]
+    if local and domain.lower() != domain:
+        candidates.append(f"{local}@{domain.lower()}")
+
+    try:
+        set_statement_timeout(db)
+        for candidate in candidates:
+            row = db.query(
+                models.User.id,
+                models.User.username,
+                models.User.password_hash,
+                models.User.role
+            ).filter(
+                models.User.email == candidate
+            ).first()
+            if row:
+                return row
+        return None
+    finally:
+        db.close()  # Release the connection before the KDF runs
+
+def _update_password_hash(db: Session, user_id: int, password_hash: str):
+    """Store a new password hash for the user and commit."""
+    set_statement_timeout(db)
+    db.query(models.User).filter(
+        models.User.id == user_id
+    ).update({models.User.password_hash: password_hash})
+    db.commit()
+
+def _save(db: Session, obj=None):
+    """Add an object (if given) and commit the session."""
+    set_statement_timeout(db)
+    if obj is not None:
+        db.add(obj)
+    db.commit()
+
 # ============================================================
 # USER REGISTRATION ENDPOINT
 # ============================================================
 @router.post("/register", response_model=dict)
-def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
+async def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
     """Register a new user account.
     
     Creates a new user with hashed password and assigns role.
@@ -31,19 +108,15 @@ def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
     Raises:
         HTTPException: If email already exists
     """
-    # Check if email already exists
-    existing_user = db.query(models.User).filter(
-        models.User.email == user.email
-    ).first()
-    
-    if existing_user:
+    # Cheap existence check first, so duplicates skip the password hash
+    if await run_in_threadpool(_email_exists, db, user.email):
         raise HTTPException(
             status_code=400,
             detail="Email already registered"
         )
     
     # Hash password for secure storage
-    hashed_password = auth.hash_password(user.password)
+    hashed_password = await auth.hash_password_async(user.password)
 
     # Create new user record
     new_user = models.User(
@@ -53,10 +126,16 @@ def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
         role=user.role
     )
 
-    # Save to database
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    # Save to database; the UNIQUE(email) constraint catches a
+    # concurrent registration that slipped past the check above
+    try:
+        await run_in_threadpool(_save, db, new_user)
+    except IntegrityError:
+        await run_in_threadpool(db.rollback)
+        raise HTTPException(
+            status_code=400,
+            detail="Email already registered"
+        )
 
     return {"message": "User registered successfully!"}
 
@@ -65,46 +144,69 @@ def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
 # USER LOGIN ENDPOINT
 # ============================================================
 @router.post("/login", response_model=schemas.Token)
-def login(user: schemas.UserLogin, db: Session = Depends(get_db)):
+async def login(
+    user: schemas.UserLogin,
+    request: Request,
+    db: Session = Depends(get_db)
+):
     """Authenticate user and return JWT token.
     
     Validates email and password, creates JWT token if valid.
     
     Args:
         user (UserLogin): Login credentials (email and password)
+        request (Request): Incoming request (client IP for the failure limit)
         db (Session): Database session (injected)
         
     Returns:
         Token: JWT access token and token type
         
     Raises:
-        HTTPException: If credentials are invalid
+        HTTPException: If credentials are invalid or too many
+            failed attempts were made for this email from this client
     """
-    # Look up user by email
-    db_user = db.query(models.User).filter(
-        models.User.email == user.email
-    ).first()
+    client = request.client.host if request.client else ""
+
+    # Reject repeated failures before the DB lookup and KDF run
+    if auth.login_blocked(client, user.email):
+        raise HTTPException(
+            status_code=429,
+            detail="Too many failed login attempts. Try again later."
+        )
+
+    # Look up user by email (only the columns needed below)
+    db_user = await run_in_threadpool(_get_login_row, db, user.email)
 
-    # Check if user exists
+    # Check if user exists (still run the KDF to keep timing uniform)
     if not db_user:
+        await auth.verify_password_async(user.password, DUMMY_PASSWORD_HASH)
+        auth.record_login_failure(client, user.email)
         raise HTTPException(
             status_code=400,
             detail="Invalid credentials"
         )
 
     # Verify password against stored hash
-    if not auth.verify_password(user.password, db_user.password_hash):
+    if not await auth.verify_password_async(user.password, db_user.password_hash):
+        auth.record_login_failure(client, user.email)
         raise HTTPException(
             status_code=400,
             detail="Invalid credentials"
         )
+    auth.clear_login_failures(client, user.email)
+
+    # Re-hash legacy bcrypt hashes or outdated Argon2 parameters
+    if auth.needs_rehash(db_user.password_hash):
+        new_hash = await auth.hash_password_async(user.password)
+        await run_in_threadpool(_update_password_hash, db, db_user.id, new_hash)
 
-    # Create JWT token with user info
+    # Create JWT token with user info; "sub" is the user ID so the
+    # token stays small and doesn't carry the email address
     token = auth.create_access_token(
-        {"sub": db_user.email, "role": db_user.role, "username": db_user.username}
+        {"sub": str(db_user.id), "role": db_user.role, "username": db_user.username}
     )
 
-    return {
-        "access_token": token,
-        "token_type": "bearer"
-    }
+    # Build the response without validation and return it directly,
+    # so FastAPI doesn't re-validate it against response_model
+    body = schemas.Token.model_construct(access_token=token, token_type="bearer")
+    return ORJSONResponse(body.model_dump())
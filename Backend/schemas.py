@@ -5,9 +5,9 @@
 # validation rules for API endpoints. Pydantic automatically
 # validates incoming data and converts between Python and JSON.
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, StringConstraints
 from datetime import datetime
-from typing import Optional
+from typing import Annotated, Optional
 
 # ============================================================
 # USER SCHEMAS
@@ -17,24 +17,31 @@ class UserCreate(BaseModel):
     
     Attributes:
         username (str): User's display name
-        email (str): User's email address
+        email (EmailStr): User's email address
         password (str): Plain text password (sent over HTTPS only)
         role (str): User role ('admin' or 'staff')
     """
-    username: str = Field(..., min_length=3, max_length=50)
-    email: str
-    password: str = Field(..., min_length=6)
-    role: str = Field(default="staff")
+    model_config = ConfigDict(strict=True)  # No type coercion on input
+
+    username: Annotated[str, StringConstraints(min_length=3, max_length=50)]
+    email: EmailStr  # Rejected at parse time, before any DB query
+    password: Annotated[str, StringConstraints(min_length=6, max_length=128)]
+    role: str = "staff"
 
 class UserLogin(BaseModel):
     """Schema for user login request.
     
     Attributes:
-        email (str): User's email address
+        email (str): User's email address, exactly as registered
         password (str): User's password
     """
-    email: str
-    password: str
+    model_config = ConfigDict(strict=True)  # No type coercion on input
+
+    # Plain string, not EmailStr: validation would normalise the domain
+    # and reject addresses that older accounts were registered with
+    email: Annotated[str, StringConstraints(max_length=254)]
+    # Length capped so oversized inputs never reach the password KDF
+    password: Annotated[str, StringConstraints(max_length=128)]
 
 class Token(BaseModel):
     """Schema for JWT token response.
@@ -58,7 +65,9 @@ class ProductCreate(BaseModel):
         price (float): Unit price
         quantity (int): Initial stock quantity
     """
-    name: str = Field(..., min_length=1, max_length=200)
+    model_config = ConfigDict(strict=True)  # No type coercion on input
+
+    name: Annotated[str, StringConstraints(min_length=1, max_length=200)]
     description: Optional[str] = None
     price: float = Field(..., ge=0)
     quantity: int = Field(..., ge=0)
@@ -79,8 +88,7 @@ class Product(BaseModel):
     price: float
     quantity: int
 
-    class Config:
-        from_attributes = True  # Allow ORM model conversion
+    model_config = ConfigDict(from_attributes=True)  # Allow ORM model conversion
 
 # ============================================================
 # SALES SCHEMAS
@@ -93,6 +101,8 @@ class SaleCreate(BaseModel):
         quantity (int): Number of units sold
         total_price (float): Total sale amount
     """
+    model_config = ConfigDict(strict=True)  # No type coercion on input
+
     product_id: int = Field(..., ge=1)
     quantity: int = Field(..., ge=1)
     total_price: float = Field(..., ge=0)
@@ -112,7 +122,6 @@ class Sale(BaseModel):
     quantity: int
     total_price: float
     sale_date: datetime
-    
-    class Config:
-        from_attributes = True  # Allow ORM model conversion
+
+    model_config = ConfigDict(from_attributes=True)  # Allow ORM model conversion
 
@@ -0,0 +1,28 @@
+// api.js — Shared API helpers
+import axios from 'axios';
+
+const PAGE_SIZE = 1000; // Backend maximum for list endpoints
+
+// Fetch every row of a paginated list endpoint (/products/, /sales/).
+// Pages through with after_id (keyset pagination) until a short page
+// comes back, so lists past PAGE_SIZE rows aren't silently truncated.
+export async function fetchAllPages(url) {
+  const rows = [];
+  let afterId;
+  for (;;) {
+    const params = { limit: PAGE_SIZE };
+    if (afterId !== undefined) params.after_id = afterId;
+    const { data } = await axios.get(url, { params });
+    rows.push(...data);
+    if (data.length < PAGE_SIZE) return { data: rows };
+    afterId = data[data.length - 1].id;
+  }
+}
+
+// Turn an axios error into display text. FastAPI validation errors
+// (422) send `detail` as an array of objects, which React can't render.
+export function errorMessage(err, fallback) {
+  const detail = err.response?.data?.detail;
+  if (Array.isArray(detail)) return detail[0]?.msg || fallback;
+  return detail || fallback;
+}
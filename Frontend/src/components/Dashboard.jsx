@@ -2,6 +2,7 @@
 import React, { useState, useEffect } from 'react';
 import { AreaChart, Area, XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContainer, BarChart, Bar, Cell } from 'recharts';
 import axios from 'axios';
+import { fetchAllPages } from '../api';
 
 const API_BASE_URL = 'http://localhost:8000';
 
@@ -126,8 +127,8 @@ export default function Dashboard({ user }) {
     (async () => {
       try {
         const [pRes, sRes, aRes] = await Promise.all([
-          axios.get(`${API_BASE_URL}/products/`),
-          axios.get(`${API_BASE_URL}/sales/`),
+          fetchAllPages(`${API_BASE_URL}/products/`),
+          fetchAllPages(`${API_BASE_URL}/sales/`),
           axios.get(`${API_BASE_URL}/sales/analytics`),
         ]);
         setProducts(pRes.data);
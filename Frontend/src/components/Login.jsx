@@ -1,6 +1,7 @@
 // Login.jsx — Split-screen premium login page (no emojis)
 import React, { useState } from 'react';
 import axios from 'axios';
+import { errorMessage } from '../api';
 import { useNavigate } from 'react-router-dom';
 
 const BrandIcon = () => (
@@ -51,7 +52,7 @@ function Login({ onLogin }) {
       onLogin(res.data.access_token);
       navigate('/');
     } catch (err) {
-      setError(err.response?.data?.detail || 'Invalid email or password');
+      setError(errorMessage(err, 'Invalid email or password'));
     } finally {
       setLoading(false);
     }
@@ -1,6 +1,7 @@
 // Products.jsx — Professional inventory management (no emojis)
 import React, { useEffect, useState } from 'react';
 import axios from 'axios';
+import { fetchAllPages } from '../api';
 
 // ── SVG Icons ─────────────────────────────────────────────────
 const IconSearch = () => <svg width="14" height="14" viewBox="0 0 24 24" fill="none" stroke="currentColor" strokeWidth="2.5" strokeLinecap="round" strokeLinejoin="round"><circle cx="11" cy="11" r="8"/><line x1="21" y1="21" x2="16.65" y2="16.65"/></svg>;
@@ -66,7 +67,7 @@ export default function Products({ token, user }) {
   const fetchProducts = async () => {
     setLoading(true);
     try {
-      const res = await axios.get('http://localhost:8000/products/');
+      const res = await fetchAllPages('http://localhost:8000/products/');
       setProducts(res.data);
       setError('');
     } catch (err) {
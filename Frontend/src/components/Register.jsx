@@ -1,6 +1,7 @@
 // Register.jsx — Split-screen premium register page (no emojis)
 import React, { useState } from 'react';
 import axios from 'axios';
+import { errorMessage } from '../api';
 import { useNavigate } from 'react-router-dom';
 
 const CheckIcon = () => (
@@ -132,7 +133,7 @@ function Register() {
       setForm({ username: '', email: '', password: '', role: 'staff' });
       setTimeout(() => navigate('/login'), 2000);
     } catch (err) {
-      setError(err.response?.data?.detail || 'Registration failed. Please try again.');
+      setError(errorMessage(err, 'Registration failed. Please try again.'));
     } finally {
       setLoading(false);
     }
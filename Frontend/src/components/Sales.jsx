@@ -2,6 +2,7 @@
 import React, { useEffect, useState } from 'react';
 import { AreaChart, Area, XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContainer, BarChart, Bar, Cell } from 'recharts';
 import axios from 'axios';
+import { fetchAllPages } from '../api';
 
 const API_BASE_URL = 'http://localhost:8000';
 
@@ -93,8 +94,8 @@ export default function Sales({ token }) {
     try {
       setLoading(true);
       const [sRes, pRes, aRes] = await Promise.all([
-        axios.get(`${API_BASE_URL}/sales/`),
-        axios.get(`${API_BASE_URL}/products/`),
+        fetchAllPages(`${API_BASE_URL}/sales/`),
+        fetchAllPages(`${API_BASE_URL}/products/`),
         axios.get(`${API_BASE_URL}/sales/analytics`),
       ]);
       setSales(sRes.data);
@@ -0,0 +1,49 @@
+import os
+import sys
+import time
+from argon2 import PasswordHasher
+
+# Pick Argon2 cost parameters for this machine.
+# Run on the production hardware:
+#   python tests/calibrate_argon2.py [target_ms]
+# Keeps time cost and parallelism fixed and binary-searches the
+# memory cost until one hash takes about target_ms (default 250).
+TARGET_MS = float(sys.argv[1]) if len(sys.argv) > 1 else 250.0
+TIME_COST = int(os.getenv("ARGON2_TIME_COST", "3"))
+PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", "4"))
+MIN_MEMORY_KIB = 8 * PARALLELISM  # Argon2 lower bound
+MAX_MEMORY_KIB = 1024 * 1024      # 1 GiB
+RUNS = 5
+
+def hash_time_ms(memory_cost):
+    """Median time in ms to hash one password with this memory cost."""
+    hasher = PasswordHasher(
+        time_cost=TIME_COST,
+        memory_cost=memory_cost,
+        parallelism=PARALLELISM
+    )
+    hasher.hash("x")  # Warm-up
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        hasher.hash("calibration-password")
+        timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)[RUNS // 2]
+
+print(f"Target: {TARGET_MS:.0f} ms (time_cost={TIME_COST}, parallelism={PARALLELISM})")
+
+low, high = MIN_MEMORY_KIB, MAX_MEMORY_KIB
+best = low
+while high - low > 1024:
+    mid = (low + high) // 2
+    elapsed = hash_time_ms(mid)
+    print(f"  memory_cost={mid:>8} KiB -> {elapsed:7.1f} ms")
+    if elapsed <= TARGET_MS:
+        best, low = mid, mid
+    else:
+        high = mid
+
+print(f"\n✅ Measured {hash_time_ms(best):.1f} ms. Add to Backend/.env:")
+print(f"ARGON2_TIME_COST={TIME_COST}")
+print(f"ARGON2_MEMORY_COST={best}")
+print(f"ARGON2_PARALLELISM={PARALLELISM}")
@@ -12,7 +12,8 @@ print(f"Checking role for: {email}")
 
 try:
     engine = create_engine(url)
-    with engine.connect() as connection:
+    # Read-only probe: AUTOCOMMIT skips the implicit BEGIN/ROLLBACK
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
         # Using text() for raw SQL query
         query = text("SELECT id, email, role FROM users WHERE email = :email")
         result = connection.execute(query, {"email": email}).fetchone()
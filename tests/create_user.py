@@ -9,8 +9,11 @@ username = "Ganindu Pabasara"
 
 print(f"Creating user: {email}")
 
+# Reuse one connection for all requests
+session = requests.Session()
+
 try:
-    response = requests.post(REGISTER_URL, json={
+    response = session.post(REGISTER_URL, json={
         "username": username,
         "email": email,
         "password": password,
@@ -9,9 +9,12 @@ password = "Ganindu5396@"
 
 print(f"1. logging in as: {email}")
 
+# Reuse one connection for all requests
+session = requests.Session()
+
 try:
     # Login
-    login_res = requests.post(LOGIN_URL, json={"email": email, "password": password})
+    login_res = session.post(LOGIN_URL, json={"email": email, "password": password})
     if login_res.status_code != 200:
         print(f"❌ Login Failed: {login_res.status_code} {login_res.text}")
         exit()
@@ -21,7 +24,7 @@ try:
 
     # Create Product
     print("\n2. Attempting to create product...")
-    headers = {"Authorization": f"Bearer {token}"}
+    session.headers.update({"Authorization": f"Bearer {token}"})
     product_payload = {
         "name": "Test Product Script",
         "description": "Created via script",
@@ -29,7 +32,7 @@ try:
         "quantity": 10
     }
 
-    res = requests.post(PRODUCT_URL, json=product_payload, headers=headers)
+    res = session.post(PRODUCT_URL, json=product_payload)
     
     print(f"Status Code: {res.status_code}")
     print(f"Response Body: {res.text}")
@@ -8,8 +8,11 @@ password = "Ganindu5396@"
 
 print(f"Attempting login for: {email}")
 
+# Reuse one connection for all requests
+session = requests.Session()
+
 try:
-    response = requests.post(LOGIN_URL, json={"email": email, "password": password})
+    response = session.post(LOGIN_URL, json={"email": email, "password": password})
     
     print(f"Status Code: {response.status_code}")
     print(f"Response: {response.text}")
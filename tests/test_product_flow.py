@@ -6,13 +6,16 @@ EMAIL = "ganindupabasara01@gmail.com"
 PASSWORD = "Ganindu5396@"
 
 def test_product_flow():
+    # One session for all calls: keeps the HTTP connection alive
+    session = requests.Session()
+
     print("1. Logging in as Admin...")
     login_payload = {
         "email": EMAIL,
         "password": PASSWORD
     }
     try:
-        response = requests.post(f"{BASE_URL}/users/login", json=login_payload)
+        response = session.post(f"{BASE_URL}/users/login", json=login_payload)
         response.raise_for_status()
         token = response.json().get("access_token")
         print("   ✅ Login successful. Token obtained.")
@@ -22,7 +25,7 @@ def test_product_flow():
             print(f"   Response: {e.response.text}")
         sys.exit(1)
 
-    headers = {"Authorization": f"Bearer {token}"}
+    session.headers.update({"Authorization": f"Bearer {token}"})
 
     print("\n2. Creating Test Product...")
     product_payload = {
@@ -32,7 +35,7 @@ def test_product_flow():
         "quantity": 10
     }
     try:
-        response = requests.post(f"{BASE_URL}/products/", json=product_payload, headers=headers)
+        response = session.post(f"{BASE_URL}/products/", json=product_payload)
         response.raise_for_status()
         product = response.json()
         product_id = product.get("id")
@@ -45,7 +48,11 @@ def test_product_flow():
 
     print("\n3. Verifying Product in List...")
     try:
-        response = requests.get(f"{BASE_URL}/products/")
+        # The list is paginated; start right before the new product
+        response = session.get(
+            f"{BASE_URL}/products/",
+            params={"after_id": product_id - 1, "limit": 1}
+        )
         response.raise_for_status()
         products = response.json()
         found = any(p['id'] == product_id for p in products)
@@ -60,7 +67,7 @@ def test_product_flow():
 
     print("\n4. Deleting Test Product...")
     try:
-        response = requests.delete(f"{BASE_URL}/products/{product_id}", headers=headers)
+        response = session.delete(f"{BASE_URL}/products/{product_id}")
         response.raise_for_status()
         print("   ✅ Product deleted successfully.")
     except Exception as e:
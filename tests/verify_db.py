@@ -11,7 +11,8 @@ print(f"Testing Connection URL: {url}")
 try:
     # Attempt connection
     engine = create_engine(url)
-    with engine.connect() as connection:
+    # Read-only probe: AUTOCOMMIT skips the implicit BEGIN/ROLLBACK
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
         result = connection.execute(text("SELECT 1"))
         print("✅ Connection Successful!")
         for row in result: